@@ -464,9 +464,10 @@ class AdvancedRecommendationEngine:
         
         top_user_genres = sorted(user_profile['genre_preferences'].items(), 
                                key=lambda x: x[1], reverse=True)[:3]
+        top_user_genre_names = {g[0] for g in top_user_genres}
         
         for genre in content_genres:
-            if genre in [g[0] for g in top_user_genres]:
+            if genre in top_user_genre_names:
                 reasons.append(f"matches your preference for {genre}")
                 break
         
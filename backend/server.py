@@ -13,6 +13,8 @@ from typing import List, Optional, Dict, Any, Union, Tuple, Set
 import uuid
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import random
 import jwt
 import asyncio
@@ -20,6 +22,8 @@ from recommendation_engine import AdvancedRecommendationEngine
 from passlib.context import CryptContext
 import bcrypt
 
+logger = logging.getLogger(__name__)
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
@@ -47,6 +51,21 @@ api_router = APIRouter(prefix="/api")
 OMDB_API_KEY = os.environ['OMDB_API_KEY']
 OMDB_BASE_URL = "http://www.omdbapi.com/"
 
+# Shared OMDB session: keeps connections alive across lookups and retries transient upstream errors
+omdb_session = requests.Session()
+_omdb_adapter = HTTPAdapter(max_retries=Retry(
+    total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], allowed_methods=["GET"]
+))
+omdb_session.mount("http://", _omdb_adapter)
+omdb_session.mount("https://", _omdb_adapter)
+
+async def omdb_get(params: dict) -> requests.Response:
+    """GET from OMDB on a worker thread so blocking I/O and retry backoff never stall the event loop"""
+    return await asyncio.to_thread(omdb_session.get, OMDB_BASE_URL, params=params, timeout=10)
+
+# Only the pair ids are needed when checking which pairs a user has already voted on
+VOTE_PAIR_PROJECTION = {"winner_id": 1, "loser_id": 1, "_id": 0}
+
 # Models
 class User(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -199,7 +218,7 @@ async def fetch_from_omdb(params: dict) -> dict:
     params["apikey"] = OMDB_API_KEY
     
     try:
-        response = requests.get(OMDB_BASE_URL, params=params, timeout=10)
+        response = await omdb_get(params)
         response.raise_for_status()
         data = response.json()
         
@@ -304,7 +323,7 @@ async def auto_add_content_on_login(user_id: str):
                     # Search for content from specific year
                     params = {"s": f"*", "y": str(year), "type": content_type, "apikey": OMDB_API_KEY}
                     
-                    response = requests.get(OMDB_BASE_URL, params=params, timeout=10)
+                    response = await omdb_get(params)
                     if response.status_code == 200:
                         search_data = response.json()
                         
@@ -336,8 +355,8 @@ async def auto_add_content_on_login(user_id: str):
                                     
                                 await asyncio.sleep(0.1)  # Rate limiting
                     
-                except Exception as e:
-                    print(f"Error searching by year {year}: {str(e)}")
+                except Exception:
+                    logger.exception("Error searching by year %s", year)
                     continue
         
         # Strategy 2: Search by popular terms
@@ -350,7 +369,7 @@ async def auto_add_content_on_login(user_id: str):
                 search_attempts += 1
                 params = {"s": search_term, "apikey": OMDB_API_KEY}
                 
-                response = requests.get(OMDB_BASE_URL, params=params, timeout=10)
+                response = await omdb_get(params)
                 if response.status_code == 200:
                     search_data = response.json()
                     
@@ -382,8 +401,8 @@ async def auto_add_content_on_login(user_id: str):
                                 
                             await asyncio.sleep(0.1)  # Rate limiting
                 
-            except Exception as e:
-                print(f"Error searching for term '{search_term}': {str(e)}")
+            except Exception:
+                logger.exception("Error searching for term '%s'", search_term)
                 continue
         
         # Strategy 3: Fallback to popular names if we haven't reached target
@@ -397,7 +416,7 @@ async def auto_add_content_on_login(user_id: str):
                     search_attempts += 1
                     params = {"s": name, "apikey": OMDB_API_KEY}
                     
-                    response = requests.get(OMDB_BASE_URL, params=params, timeout=10)
+                    response = await omdb_get(params)
                     if response.status_code == 200:
                         search_data = response.json()
                         
@@ -429,17 +448,15 @@ async def auto_add_content_on_login(user_id: str):
                                     
                                 await asyncio.sleep(0.1)  # Rate limiting
                     
-                except Exception as e:
-                    print(f"Error searching for name '{name}': {str(e)}")
+                except Exception:
+                    logger.exception("Error searching for name '%s'", name)
                     continue
         
         final_count = await db.content.count_documents({})
         print(f"Auto content addition completed for user {user_id}: {added_count} new items added (total: {final_count})")
         
-    except Exception as e:
-        print(f"Error in auto_add_content_on_login: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error in auto_add_content_on_login")
 
 
 async def add_content_from_imdb_id(imdb_id: str, existing_imdb_ids: set, existing_titles: set) -> bool:
@@ -448,7 +465,7 @@ async def add_content_from_imdb_id(imdb_id: str, existing_imdb_ids: set, existin
         # Get detailed info for this IMDB ID
         params = {"i": imdb_id, "apikey": OMDB_API_KEY, "plot": "full"}
         
-        response = requests.get(OMDB_BASE_URL, params=params, timeout=10)
+        response = await omdb_get(params)
         if response.status_code == 200:
             omdb_data = response.json()
             
@@ -496,8 +513,8 @@ async def add_content_from_imdb_id(imdb_id: str, existing_imdb_ids: set, existin
         
         return False
         
-    except Exception as e:
-        print(f"Error adding content for IMDB ID {imdb_id}: {str(e)}")
+    except Exception:
+        logger.exception("Error adding content for IMDB ID %s", imdb_id)
         return False
 
 # Initialize popular content - Expanded for richer experience
@@ -799,7 +816,7 @@ async def initialize_content():
             except Exception as e:
                 error_msg = f"Movie {movie}: {str(e)}"
                 initialized["errors"].append(error_msg)
-                print(f"Error adding {movie}: {str(e)}")
+                logger.exception("Error adding %s", movie)
         
         # Process TV shows in batches
         print(f"Initializing {len(POPULAR_TV_SHOWS)} TV shows...")
@@ -822,7 +839,7 @@ async def initialize_content():
             except Exception as e:
                 error_msg = f"Series {show}: {str(e)}"
                 initialized["errors"].append(error_msg)
-                print(f"Error adding {show}: {str(e)}")
+                logger.exception("Error adding %s", show)
         
         # Get final count
         final_count = await db.content.count_documents({})
@@ -837,6 +854,7 @@ async def initialize_content():
         return result
         
     except Exception as e:
+        logger.exception("Error initializing content")
         raise HTTPException(status_code=500, detail=str(e))
 async def clear_content():
     """Clear all content from database"""
@@ -844,6 +862,7 @@ async def clear_content():
         result = await db.content.delete_many({})
         return {"message": f"Cleared {result.deleted_count} content items"}
     except Exception as e:
+        logger.exception("Error clearing content")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.post("/force-reinitialize-content")
@@ -861,6 +880,7 @@ async def force_reinitialize_content():
             "reinitialized": init_result
         }
     except Exception as e:
+        logger.exception("Error force-reinitializing content")
         raise HTTPException(status_code=500, detail=str(e))
 async def initialize_content():
     """Initialize database with popular movies and TV shows"""
@@ -893,7 +913,7 @@ async def initialize_content():
             except Exception as e:
                 error_msg = f"Movie {movie}: {str(e)}"
                 initialized["errors"].append(error_msg)
-                print(f"Error adding {movie}: {str(e)}")
+                logger.exception("Error adding %s", movie)
         
         # Process TV shows in batches
         print(f"Initializing {len(POPULAR_TV_SHOWS)} TV shows...")
@@ -916,7 +936,7 @@ async def initialize_content():
             except Exception as e:
                 error_msg = f"Series {show}: {str(e)}"
                 initialized["errors"].append(error_msg)
-                print(f"Error adding {show}: {str(e)}")
+                logger.exception("Error adding %s", show)
         
         # Get final count
         final_count = await db.content.count_documents({})
@@ -931,6 +951,7 @@ async def initialize_content():
         return result
         
     except Exception as e:
+        logger.exception("Error initializing content")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.post("/session")
@@ -985,12 +1006,12 @@ async def get_replacement_voting_pair(
     
     # Get user's vote history to avoid showing same pairs
     if user_identifier[0] == "user":
-        user_votes = await db.votes.find({"user_id": user_identifier[1]}).to_list(length=None)
+        vote_query = {"user_id": user_identifier[1]}
     else:
-        user_votes = await db.votes.find({"session_id": user_identifier[1]}).to_list(length=None)
+        vote_query = {"session_id": user_identifier[1]}
     
     voted_pairs = set()
-    for vote in user_votes:
+    async for vote in db.votes.find(vote_query, VOTE_PAIR_PROJECTION).batch_size(500):
         pair = frozenset([vote["winner_id"], vote["loser_id"]])
         voted_pairs.add(pair)
     
@@ -1051,12 +1072,12 @@ async def get_voting_pair(
     
     # Get user's vote history to avoid showing same pairs
     if user_identifier[0] == "user":
-        user_votes = await db.votes.find({"user_id": user_identifier[1]}).to_list(length=None)
+        vote_query = {"user_id": user_identifier[1]}
     else:
-        user_votes = await db.votes.find({"session_id": user_identifier[1]}).to_list(length=None)
+        vote_query = {"session_id": user_identifier[1]}
     
     voted_pairs = set()
-    for vote in user_votes:
+    async for vote in db.votes.find(vote_query, VOTE_PAIR_PROJECTION).batch_size(500):
         pair = frozenset([vote["winner_id"], vote["loser_id"]])
         voted_pairs.add(pair)
     
@@ -1149,8 +1170,8 @@ async def _get_all_content_items_as_df(app_db) -> Optional[pd.DataFrame]:
     try:
         content_df = current_recommendation_engine.extract_content_features(all_content_dicts)
         return content_df
-    except Exception as e:
-        print(f"Error featurizing content: {e}")
+    except Exception:
+        logger.exception("Error featurizing content")
         return None
 
 async def _get_candidate_items_for_pairing(
@@ -1252,7 +1273,7 @@ async def _get_candidate_items_for_pairing(
 
         # Generate a larger list of recommendations
         raw_recommendations = current_recommendation_engine.generate_recommendations(
-            user_profile, eligible_content_df, list(watched_content_ids), num_recommendations * 2 # Get more to pick from
+            user_profile, eligible_content_df, list(watched_content_ids), num_candidates * 2 # Get more to pick from
         )
         candidate_items = raw_recommendations[:num_candidates] # Take top N as candidates
 
@@ -1484,10 +1505,8 @@ async def submit_vote(
                     # Run recommendation generation in background (fire and forget)
                     task = asyncio.create_task(auto_generate_ai_recommendations(current_user.id))
                     # Don't await the task - let it run in background
-            except Exception as e:
-                print(f"Background recommendation generation error: {str(e)}")
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                logger.exception("Background recommendation generation error")
         
         return {
             "vote_recorded": True,
@@ -1576,10 +1595,8 @@ async def get_recommendations(
                 # For subsequent pages, return empty if no stored recommendations
                 return []
             
-        except Exception as e:
-            print(f"Error in AI recommendations: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error in AI recommendations")
             # Fall back to simple recommendations on error (only for first page)
             if offset == 0:
                 user_votes = await db.votes.find({"user_id": current_user.id}).to_list(length=None)
@@ -1629,10 +1646,8 @@ async def check_and_auto_refresh_recommendations(user_id: str) -> bool:
         
         return refresh_needed
         
-    except Exception as e:
-        print(f"Error checking refresh need: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error checking refresh need")
         return True  # Default to refresh on error
 
 async def get_stored_ai_recommendations(user_id: str, offset: int = 0, limit: int = 20) -> List[Recommendation]:
@@ -1644,21 +1659,24 @@ async def get_stored_ai_recommendations(user_id: str, offset: int = 0, limit: in
             "viewed": False
         }).sort("recommendation_score", -1).to_list(length=None)
         
-        # Get watched content IDs to exclude from recommendations
-        watched_interactions = await db.user_interactions.find({
-            "user_id": user_id,
-            "interaction_type": "watched"
-        }).to_list(length=None)
-        
-        watched_content_ids = [i["content_id"] for i in watched_interactions]
+        # Get watched and "not_interested" content IDs to exclude from recommendations.
+        # A set, since every stored recommendation is checked against it
+        excluded_interactions = await db.user_interactions.find(
+            {"user_id": user_id, "interaction_type": {"$in": ["watched", "not_interested"]}},
+            {"content_id": 1, "_id": 0}
+        ).to_list(length=None)
         
-        # Also exclude content user marked as "not_interested"
-        not_interested = await db.user_interactions.find({
-            "user_id": user_id,
-            "interaction_type": "not_interested"
-        }).to_list(length=None)
+        watched_content_ids = {i["content_id"] for i in excluded_interactions}
         
-        watched_content_ids.extend([i["content_id"] for i in not_interested])
+        # Resolve every recommended content item in one $in lookup instead of one find_one per recommendation
+        rec_content_ids = list({rec["content_id"] for rec in all_stored_recs})
+        content_by_id = {
+            content["id"]: content
+            async for content in db.content.find(
+                {"id": {"$in": rec_content_ids}},
+                {"id": 1, "title": 1, "poster": 1, "imdb_id": 1, "_id": 0}
+            )
+        }
         
         # Track seen content IDs and IMDB IDs to prevent duplicates
         seen_content_ids = set()
@@ -1675,7 +1693,7 @@ async def get_stored_ai_recommendations(user_id: str, offset: int = 0, limit: in
             if rec["content_id"] in watched_content_ids:
                 continue
                 
-            content = await db.content.find_one({"id": rec["content_id"]})
+            content = content_by_id.get(rec["content_id"])
             if content:
                 # Skip if we've already seen this IMDB ID
                 if content["imdb_id"] in seen_imdb_ids:
@@ -1703,10 +1721,8 @@ async def get_stored_ai_recommendations(user_id: str, offset: int = 0, limit: in
         # Extract just the recommendation objects
         return [item["recommendation"] for item in paginated_recommendations]
         
-    except Exception as e:
-        print(f"Error getting stored recommendations for user {user_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error getting stored recommendations for user %s", user_id)
         return []
 
 async def auto_generate_ai_recommendations(user_id: str):
@@ -1816,10 +1832,8 @@ async def auto_generate_ai_recommendations(user_id: str):
         
         print(f"Auto-generated {len(unique_recommendations)} unique recommendations for user {user_id}")
         
-    except Exception as e:
-        print(f"Error auto-generating recommendations for user {user_id}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Error auto-generating recommendations for user %s", user_id)
 
 async def generate_realtime_recommendations(user_id: str, limit: int = 20) -> List[Recommendation]:
     """Generate recommendations in real-time as fallback"""
@@ -1916,8 +1930,8 @@ async def generate_realtime_recommendations(user_id: str, limit: int = 20) -> Li
         
         return recommendations
         
-    except Exception as e:
-        print(f"Error generating realtime recommendations: {str(e)}")
+    except Exception:
+        logger.exception("Error generating realtime recommendations")
         return []
 
 async def get_simple_recommendations_fallback(user_votes: List[Dict], offset: int = 0, limit: int = 20) -> List[Recommendation]:
@@ -1983,20 +1997,26 @@ async def get_user_stats(
 ):
     """Get user voting statistics"""
     if current_user:
-        user_votes = await db.votes.find({"user_id": current_user.id}).to_list(length=None)
-        total_votes = len(user_votes)
+        vote_query = {"user_id": current_user.id}
     elif session_id:
         session = await db.sessions.find_one({"session_id": session_id})
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
-        user_votes = await db.votes.find({"session_id": session_id}).to_list(length=None)
-        total_votes = len(user_votes)
+        vote_query = {"session_id": session_id}
     else:
         raise HTTPException(status_code=400, detail="Either login or provide session_id")
     
-    # Count by content type
-    movie_votes = len([v for v in user_votes if v["content_type"] == "movie"])
-    series_votes = len([v for v in user_votes if v["content_type"] == "series"])
+    # Count by content type in a single server-side pass
+    counts_by_type = {}
+    async for row in db.votes.aggregate([
+        {"$match": vote_query},
+        {"$group": {"_id": "$content_type", "n": {"$sum": 1}}}
+    ]):
+        counts_by_type[row["_id"]] = row["n"]
+    
+    total_votes = sum(counts_by_type.values())
+    movie_votes = counts_by_type.get("movie", 0)
+    series_votes = counts_by_type.get("series", 0)
     
     return {
         "total_votes": total_votes,
@@ -2064,10 +2084,8 @@ async def content_interaction(
                 # Trigger background recommendation refresh on content interactions
                 # since these are strong preference signals
                 task = asyncio.create_task(auto_generate_ai_recommendations(current_user.id))
-        except Exception as e:
-            print(f"Background recommendation generation error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Background recommendation generation error")
     
     return {"success": True, "interaction_recorded": True}
 
@@ -2182,6 +2200,7 @@ async def get_content_count():
         count = await db.content.count_documents({})
         return {"count": count}
     except Exception as e:
+        logger.exception("Error counting content")
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/content/{content_id}/user-status")
@@ -2203,7 +2222,7 @@ async def get_content_user_status(
     else:
         query["session_id"] = session_id
     
-    interactions = await db.user_interactions.find(query).to_list(length=None)
+    interactions = await db.user_interactions.find(query, {"interaction_type": 1, "_id": 0}).to_list(length=None)
     
     # Check if in watchlist (only for authenticated users)
     in_watchlist = False
@@ -2217,13 +2236,16 @@ async def get_content_user_status(
             in_watchlist = True
             watchlist_type = watchlist_item["watchlist_type"]
     
+    interaction_types = [i["interaction_type"] for i in interactions]
+    interaction_type_set = set(interaction_types)
+    
     return {
-        "interactions": [i["interaction_type"] for i in interactions],
+        "interactions": interaction_types,
         "in_watchlist": in_watchlist,
         "watchlist_type": watchlist_type,
-        "has_watched": "watched" in [i["interaction_type"] for i in interactions],
-        "wants_to_watch": "want_to_watch" in [i["interaction_type"] for i in interactions],
-        "not_interested": "not_interested" in [i["interaction_type"] for i in interactions]
+        "has_watched": "watched" in interaction_type_set,
+        "wants_to_watch": "want_to_watch" in interaction_type_set,
+        "not_interested": "not_interested" in interaction_type_set
     }
 # Initialize ML Recommendation Engine
 recommendation_engine = AdvancedRecommendationEngine()
@@ -2346,7 +2368,7 @@ async def generate_ml_recommendations(
         }
         
     except Exception as e:
-        logger.error(f"Error generating recommendations: {str(e)}")
+        logger.exception("Error generating recommendations")
         raise HTTPException(status_code=500, detail=f"Failed to generate recommendations: {str(e)}")
 
 @api_router.get("/recommendations/refresh-needed")
@@ -2491,7 +2513,16 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
-logger = logging.getLogger(__name__)
+
+@app.on_event("startup")
+async def create_indexes():
+    """Ensure indexes backing the per-user vote and interaction lookups"""
+    await db.content.create_index([("id", 1)])
+    await db.content.create_index([("imdb_id", 1)])
+    await db.user_interactions.create_index([("user_id", 1), ("content_id", 1)])
+    await db.votes.create_index([("user_id", 1), ("winner_id", 1)])
+    await db.votes.create_index([("user_id", 1), ("loser_id", 1)])
+    await db.votes.create_index([("session_id", 1)])
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
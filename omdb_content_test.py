@@ -1,13 +1,19 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import unittest
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import random
 import string
 import uuid
 from datetime import datetime
 import json
+import re
 import pymongo
+from pymongo.errors import OperationFailure, PyMongoError
 import logging
 
 # Configure logging
@@ -17,6 +23,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger("omdb_content_test")
 
+# (connect, read) timeout for every HTTP call made by the tester
+REQUEST_TIMEOUT = (3.05, 30)
+
+# New content expected per registration/login, and how long to wait for it (seconds)
+CONTENT_ADDITION_TARGET = 50
+CONTENT_WAIT_TIMEOUT = 10
+# Count polling interval when change streams are unavailable (standalone mongod)
+CONTENT_POLL_INTERVAL = 0.5
+
+# Metadata fields checked by the content quality metrics
+QUALITY_FIELDS = ("imdb_id", "title", "year", "genre", "poster", "plot", "actors", "director")
+
+def _field_present(field):
+    """Aggregation expression that is true when `field` is set and non-empty"""
+    return {"$and": [{"$ifNull": [f"${field}", False]}, {"$ne": [f"${field}", ""]}]}
+
+# Search terms for strategy 2
+SEARCH_TERMS = (
+    "Marvel", "DC", "Star Wars", "Fast", "John Wick", "Mission Impossible",
+    "Avatar", "Jurassic", "Transformers", "Spider", "Batman", "Superman",
+    "Comedy", "Action", "Drama", "Horror", "Thriller", "Romance", "Adventure", "Sci-Fi", "Fantasy",
+    "Korean", "Japanese", "French", "Spanish", "Italian", "German",
+    "Original", "Netflix", "Amazon", "Disney", "HBO", "Apple"
+)
+
+# Popular names for strategy 3
+POPULAR_NAMES = (
+    "Tom Hanks", "Leonardo DiCaprio", "Meryl Streep", "Denzel Washington",
+    "Scarlett Johansson", "Ryan Reynolds", "The Rock", "Jennifer Lawrence",
+    "Brad Pitt", "Angelina Jolie", "Will Smith", "Chris Evans",
+    "Robert Downey", "Christopher Nolan", "Quentin Tarantino", "Martin Scorsese"
+)
+
+# Alternation patterns, so each field is scanned once rather than once per term (matched case-insensitively)
+SEARCH_TERMS_PATTERN = "|".join(map(re.escape, SEARCH_TERMS))
+POPULAR_NAMES_PATTERN = "|".join(map(re.escape, POPULAR_NAMES))
+
+# Number of recently added items logged as samples
+SAMPLE_CONTENT_LIMIT = 5
+
+# Top-level section headers in test_result.md that new findings are inserted under
+TEST_RESULT_SECTION_RE = re.compile(r"^(backend|agent_communication):", re.MULTILINE)
+
+# Fields read from recently added content for the sample output
+RECENT_CONTENT_PROJECTION = {field: 1 for field in QUALITY_FIELDS + ("content_type", "created_at")}
+
 class DynamicOMDBContentTester:
     def __init__(self, base_url="https://4fa5a25b-d44d-470b-8afe-5cd4e20504f0.preview.emergentagent.com/api"):
         self.base_url = base_url
@@ -26,10 +78,21 @@ class DynamicOMDBContentTester:
         self.tests_passed = 0
         self.test_results = []
         
-        # Test user credentials
-        self.test_user_email = f"test_user_{datetime.now().strftime('%Y%m%d%H%M%S')}@example.com"
+        # Shared HTTP session so API and OMDB calls reuse keep-alive connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        # Test user credentials (one timestamp so email and name always agree)
+        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        self.test_user_email = f"test_user_{timestamp}@example.com"
         self.test_user_password = "TestPassword123!"
-        self.test_user_name = f"Test User {datetime.now().strftime('%H%M%S')}"
+        self.test_user_name = f"Test User {timestamp[-6:]}"
         
         # MongoDB connection
         self.mongo_client = pymongo.MongoClient("mongodb://localhost:27017")
@@ -48,30 +111,26 @@ class DynamicOMDBContentTester:
             headers['Authorization'] = f'Bearer {self.auth_token}'
         
         self.tests_run += 1
-        logger.info(f"\n🔍 Testing {name}...")
+        logger.info("\n🔍 Testing %s...", name)
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, params=params)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=headers)
+            response = self.session.request(
+                method, url, json=data, headers=headers, params=params, timeout=REQUEST_TIMEOUT
+            )
 
             success = response.status_code == expected_status
             if success:
                 self.tests_passed += 1
-                logger.info(f"✅ Passed - Status: {response.status_code}")
+                logger.info("✅ Passed - Status: %s", response.status_code)
                 self.test_results.append({"name": name, "status": "PASS", "details": f"Status: {response.status_code}"})
             else:
-                logger.error(f"❌ Failed - Expected {expected_status}, got {response.status_code}")
+                logger.error("❌ Failed - Expected %s, got %s", expected_status, response.status_code)
                 self.test_results.append({"name": name, "status": "FAIL", "details": f"Expected {expected_status}, got {response.status_code}"})
 
+            # Parse the raw bytes directly; json detects the encoding without building response.text first
             try:
-                return success, response.json() if response.text else {}
-            except:
+                return success, json.loads(response.content) if response.content else {}
+            except ValueError:
                 return success, {}
 
         except Exception as e:
@@ -82,13 +141,43 @@ class DynamicOMDBContentTester:
     def get_content_count(self):
         """Get the current total count of content in the database"""
         try:
-            count = self.db.content.count_documents({})
+            count = self.db.content.estimated_document_count()
             logger.info(f"📊 Current content count: {count} items")
             return count
         except Exception as e:
             logger.error(f"❌ Error getting content count: {str(e)}")
             return 0
 
+    def open_insert_stream(self):
+        """Open a change stream of content inserts, or return None if the deployment has no change streams"""
+        try:
+            return self.db.content.watch([{"$match": {"operationType": "insert"}}], max_await_time_ms=500)
+        except OperationFailure as e:
+            logger.warning(f"⚠️ Change streams unavailable, polling the content count instead: {str(e)}")
+            return None
+
+    def wait_for_content_additions(self, insert_stream, baseline_count):
+        """Wait until CONTENT_ADDITION_TARGET new items are seen or the timeout passes; return how many were seen (capped at the target)"""
+        deadline = time.monotonic() + CONTENT_WAIT_TIMEOUT
+        added = 0
+        
+        try:
+            if insert_stream is not None:
+                while added < CONTENT_ADDITION_TARGET and time.monotonic() < deadline:
+                    if insert_stream.try_next() is not None:
+                        added += 1
+            else:
+                while time.monotonic() < deadline:
+                    added = self.db.content.estimated_document_count() - baseline_count
+                    if added >= CONTENT_ADDITION_TARGET:
+                        break
+                    time.sleep(CONTENT_POLL_INTERVAL)
+        finally:
+            if insert_stream is not None:
+                insert_stream.close()
+        
+        return added
+
     def test_user_registration(self):
         """Test user registration"""
         data = {
@@ -138,185 +227,204 @@ class DynamicOMDBContentTester:
         
         return False, response
 
-    def check_content_quality(self, content_items):
-        """Check the quality of content items"""
-        quality_metrics = {
-            "with_imdb_id": 0,
-            "with_title": 0,
-            "with_year": 0,
-            "with_genre": 0,
-            "with_poster": 0,
-            "with_plot": 0,
-            "with_actors": 0,
-            "with_director": 0,
-            "total": len(content_items)
-        }
+    def compute_quality_metrics_db(self, since_ts, until_ts):
+        """Count populated metadata fields on content added between `since_ts` and `until_ts`, in-database"""
+        group_stage = {"_id": None, "total": {"$sum": 1}}
+        for field in QUALITY_FIELDS:
+            group_stage[f"with_{field}"] = {"$sum": {"$cond": [_field_present(field), 1, 0]}}
+        
+        pipeline = [
+            {"$match": {"created_at": {"$gte": since_ts, "$lt": until_ts}}},
+            {"$project": {field: 1 for field in QUALITY_FIELDS}},
+            {"$group": group_stage}
+        ]
+        
+        quality_metrics = {f"with_{field}": 0 for field in QUALITY_FIELDS}
+        quality_metrics["total"] = 0
         
-        for item in content_items:
-            if item.get("imdb_id"):
-                quality_metrics["with_imdb_id"] += 1
-            if item.get("title"):
-                quality_metrics["with_title"] += 1
-            if item.get("year"):
-                quality_metrics["with_year"] += 1
-            if item.get("genre"):
-                quality_metrics["with_genre"] += 1
-            if item.get("poster"):
-                quality_metrics["with_poster"] += 1
-            if item.get("plot"):
-                quality_metrics["with_plot"] += 1
-            if item.get("actors"):
-                quality_metrics["with_actors"] += 1
-            if item.get("director"):
-                quality_metrics["with_director"] += 1
+        result = next(self.db.content.aggregate(pipeline), None)
+        if result:
+            result.pop("_id", None)
+            quality_metrics.update(result)
         
+        return quality_metrics
+
+    def check_content_quality(self, quality_metrics):
+        """Check the quality of content items from their computed metrics"""
         # Calculate percentages
-        for key in quality_metrics:
-            if key != "total":
-                percentage = (quality_metrics[key] / quality_metrics["total"]) * 100 if quality_metrics["total"] > 0 else 0
-                logger.info(f"📊 {key}: {quality_metrics[key]}/{quality_metrics['total']} ({percentage:.1f}%)")
+        total = quality_metrics["total"]
+        for field in QUALITY_FIELDS:
+            key = f"with_{field}"
+            count = quality_metrics[key]
+            percentage = (count / total) * 100 if total > 0 else 0
+            logger.info("📊 %s: %s/%s (%.1f%%)", key, count, total, percentage)
         
         return quality_metrics
 
-    def check_content_diversity(self, content_items):
-        """Check the diversity of content items"""
+    def compute_diversity_metrics_db(self, since_ts, until_ts):
+        """Count content types, years and genres of content added between `since_ts` and `until_ts`, in-database"""
+        pipeline = [
+            {"$match": {"created_at": {"$gte": since_ts, "$lt": until_ts}}},
+            {"$project": {"content_type": 1, "year": 1, "genre": 1}},
+            {"$facet": {
+                "total": [{"$count": "n"}],
+                "content_types": [
+                    {"$group": {"_id": {"$ifNull": ["$content_type", "unknown"]}, "count": {"$sum": 1}}}
+                ],
+                "years": [
+                    {"$group": {"_id": {"$ifNull": ["$year", "unknown"]}, "count": {"$sum": 1}}}
+                ],
+                # Genres are stored as a comma-separated string
+                "genres": [
+                    {"$match": {"genre": {"$nin": [None, ""]}}},
+                    # Split and trim in one stage, before $unwind multiplies the documents
+                    {"$project": {"genre": {"$map": {
+                        "input": {"$split": ["$genre", ","]},
+                        "in": {"$trim": {"input": "$$this"}}
+                    }}}},
+                    {"$unwind": "$genre"},
+                    {"$match": {"genre": {"$ne": ""}}},
+                    {"$group": {"_id": "$genre", "count": {"$sum": 1}}}
+                ]
+            }}
+        ]
+        
+        facets = next(self.db.content.aggregate(pipeline), {})
+        total = facets.get("total") or [{"n": 0}]
         diversity_metrics = {
-            "content_types": {},
-            "years": {},
-            "genres": {},
-            "total": len(content_items)
+            "content_types": Counter({row["_id"]: row["count"] for row in facets.get("content_types", [])}),
+            "years": Counter({row["_id"]: row["count"] for row in facets.get("years", [])}),
+            "genres": Counter({row["_id"]: row["count"] for row in facets.get("genres", [])}),
+            "total": total[0]["n"]
         }
         
-        for item in content_items:
-            # Content type
-            content_type = item.get("content_type", "unknown")
-            diversity_metrics["content_types"][content_type] = diversity_metrics["content_types"].get(content_type, 0) + 1
-            
-            # Year
-            year = item.get("year", "unknown")
-            diversity_metrics["years"][year] = diversity_metrics["years"].get(year, 0) + 1
-            
-            # Genres (split by comma)
-            if item.get("genre"):
-                genres = [g.strip() for g in item.get("genre", "").split(",")]
-                for genre in genres:
-                    if genre:
-                        diversity_metrics["genres"][genre] = diversity_metrics["genres"].get(genre, 0) + 1
-        
+        return diversity_metrics
+
+    def check_content_diversity(self, diversity_metrics):
+        """Check the diversity of content items from their computed metrics"""
         # Log content types
         logger.info(f"📊 Content Types:")
         for content_type, count in diversity_metrics["content_types"].items():
             percentage = (count / diversity_metrics["total"]) * 100 if diversity_metrics["total"] > 0 else 0
-            logger.info(f"  - {content_type}: {count} ({percentage:.1f}%)")
+            logger.info("  - %s: %s (%.1f%%)", content_type, count, percentage)
         
         # Log years (top 5)
         logger.info(f"📊 Years (top 5):")
-        years_sorted = sorted(diversity_metrics["years"].items(), key=lambda x: x[1], reverse=True)[:5]
-        for year, count in years_sorted:
+        for year, count in diversity_metrics["years"].most_common(5):
             percentage = (count / diversity_metrics["total"]) * 100 if diversity_metrics["total"] > 0 else 0
-            logger.info(f"  - {year}: {count} ({percentage:.1f}%)")
+            logger.info("  - %s: %s (%.1f%%)", year, count, percentage)
         
         # Log genres (top 10)
         logger.info(f"📊 Genres (top 10):")
-        genres_sorted = sorted(diversity_metrics["genres"].items(), key=lambda x: x[1], reverse=True)[:10]
-        for genre, count in genres_sorted:
+        for genre, count in diversity_metrics["genres"].most_common(10):
             percentage = (count / diversity_metrics["total"]) * 100 if diversity_metrics["total"] > 0 else 0
-            logger.info(f"  - {genre}: {count} ({percentage:.1f}%)")
+            logger.info("  - %s: %s (%.1f%%)", genre, count, percentage)
         
         return diversity_metrics
 
-    def check_content_strategies(self, content_items):
-        """Check if content items match the three strategies"""
+    def compute_strategy_metrics_db(self, since_ts, until_ts):
+        """Bucket content added between `since_ts` and `until_ts` by the strategy it matches, in-database"""
+        # Current year for recent years strategy
+        current_year = datetime.now().year
+        recent_years = [str(current_year - offset) for offset in range(4)]
+        
+        def matches(field, pattern):
+            return {"$regexMatch": {"input": {"$ifNull": [f"${field}", ""]}, "regex": pattern, "options": "i"}}
+        
+        # Buckets are exclusive and checked in order, so each item lands in its first matching strategy
+        pipeline = [
+            {"$match": {"created_at": {"$gte": since_ts, "$lt": until_ts}}},
+            {"$project": {"strategy": {"$switch": {
+                "branches": [
+                    # Compare the four-character year prefix by membership rather than a regex
+                    {"case": {"$in": [{"$substrCP": [{"$ifNull": ["$year", ""]}, 0, 4]}, recent_years]},
+                     "then": "recent_years"},
+                    {"case": matches("title", SEARCH_TERMS_PATTERN), "then": "search_terms"},
+                    {"case": {"$or": [matches("actors", POPULAR_NAMES_PATTERN),
+                                      matches("director", POPULAR_NAMES_PATTERN)]},
+                     "then": "popular_names"}
+                ],
+                "default": "unknown"
+            }}}},
+            {"$group": {"_id": "$strategy", "count": {"$sum": 1}}}
+        ]
+        
         strategy_metrics = {
             "recent_years": 0,
             "search_terms": 0,
             "popular_names": 0,
             "unknown": 0,
-            "total": len(content_items)
+            "total": 0
         }
         
-        # Current year for recent years strategy
-        current_year = datetime.now().year
-        recent_years = [str(current_year), str(current_year - 1), str(current_year - 2), str(current_year - 3)]
-        
-        # Search terms for strategy 2
-        search_terms = [
-            "Marvel", "DC", "Star Wars", "Fast", "John Wick", "Mission Impossible",
-            "Avatar", "Jurassic", "Transformers", "Spider", "Batman", "Superman",
-            "Comedy", "Action", "Drama", "Horror", "Thriller", "Romance", "Adventure", "Sci-Fi", "Fantasy",
-            "Korean", "Japanese", "French", "Spanish", "Italian", "German",
-            "Original", "Netflix", "Amazon", "Disney", "HBO", "Apple"
-        ]
-        
-        # Popular names for strategy 3
-        popular_names = [
-            "Tom Hanks", "Leonardo DiCaprio", "Meryl Streep", "Denzel Washington",
-            "Scarlett Johansson", "Ryan Reynolds", "The Rock", "Jennifer Lawrence",
-            "Brad Pitt", "Angelina Jolie", "Will Smith", "Chris Evans",
-            "Robert Downey", "Christopher Nolan", "Quentin Tarantino", "Martin Scorsese"
-        ]
-        
-        for item in content_items:
-            year = item.get("year", "")
-            title = item.get("title", "")
-            actors = item.get("actors", "")
-            director = item.get("director", "")
-            
-            # Check strategy 1: Recent years
-            if any(year.startswith(recent_year) for recent_year in recent_years):
-                strategy_metrics["recent_years"] += 1
-                continue
-            
-            # Check strategy 2: Search terms
-            if any(term.lower() in title.lower() for term in search_terms):
-                strategy_metrics["search_terms"] += 1
-                continue
-            
-            # Check strategy 3: Popular names
-            if any(name.lower() in actors.lower() or name.lower() in director.lower() for name in popular_names):
-                strategy_metrics["popular_names"] += 1
-                continue
-            
-            # If no strategy matched
-            strategy_metrics["unknown"] += 1
+        for row in self.db.content.aggregate(pipeline):
+            strategy_metrics[row["_id"]] = row["count"]
+            strategy_metrics["total"] += row["count"]
         
+        return strategy_metrics
+
+    def check_content_strategies(self, strategy_metrics):
+        """Check if content items match the three strategies from their computed metrics"""
         # Log strategy metrics
         logger.info(f"📊 Content Strategy Metrics:")
         for strategy, count in strategy_metrics.items():
             if strategy != "total":
                 percentage = (count / strategy_metrics["total"]) * 100 if strategy_metrics["total"] > 0 else 0
-                logger.info(f"  - {strategy}: {count} ({percentage:.1f}%)")
+                logger.info("  - %s: %s (%.1f%%)", strategy, count, percentage)
         
         return strategy_metrics
 
+    def ensure_created_at_index(self):
+        """Create the created_at index backing the recent-content scan; False if it could not be created"""
+        try:
+            self.db.content.create_index([("created_at", pymongo.DESCENDING)])
+            return True
+        except PyMongoError as e:
+            logger.warning("Could not create content created_at index, scanning without it: %s", e)
+            return False
+
+    def get_recent_content_sample(self, limit, use_index=False):
+        """Fetch the most recently added content items, newest first"""
+        cursor = self.db.content.find({}, RECENT_CONTENT_PROJECTION)
+        if use_index:
+            cursor = cursor.hint([("created_at", pymongo.DESCENDING)])
+        return list(cursor.sort("created_at", pymongo.DESCENDING).limit(limit))
+
     def test_dynamic_content_addition(self):
         """Test the dynamic OMDB content addition system"""
         logger.info("\n🔍 TESTING DYNAMIC OMDB CONTENT ADDITION SYSTEM")
         
         # Step 1: Get initial content count
         logger.info("\n📋 Step 1: Get initial content count")
+        since_ts = datetime.utcnow()
         initial_count = self.get_content_count()
         
         # Step 2: Register a new user (should trigger auto_add_content_on_login)
         logger.info("\n📋 Step 2: Register a new user (should trigger auto_add_content_on_login)")
+        # Opened before registering so no insert made during the request is missed
+        insert_stream = self.open_insert_stream()
         start_time = time.time()
         reg_success, reg_response = self.test_user_registration()
         registration_time = time.time() - start_time
         
         if not reg_success:
             logger.error("❌ Failed to register user, stopping test")
+            if insert_stream is not None:
+                insert_stream.close()
             return False
         
         logger.info(f"✅ User registration completed in {registration_time:.2f} seconds")
         
         # Step 3: Wait a bit for content addition to complete
         logger.info("\n📋 Step 3: Wait for content addition to complete")
-        logger.info("Waiting 10 seconds for background content addition...")
-        time.sleep(10)
+        logger.info(f"Waiting up to {CONTENT_WAIT_TIMEOUT} seconds for background content addition...")
+        self.wait_for_content_additions(insert_stream, initial_count)
         
-        # Step 4: Get new content count
+        # Step 4: Get new content count (measured, since the wait stops counting at the target)
         logger.info("\n📋 Step 4: Get new content count")
         new_count = self.get_content_count()
+        # Closes the metric window so inserts made after this count stay out of the aggregations
+        until_ts = datetime.utcnow()
         added_count = new_count - initial_count
         
         logger.info(f"📊 Initial content count: {initial_count}")
@@ -332,34 +440,43 @@ class DynamicOMDBContentTester:
         logger.info("\n📋 Step 5: Check the quality of newly added content")
         
         try:
-            # Get the most recently added content
-            recent_content = list(self.db.content.find().sort("created_at", -1).limit(added_count))
+            recent_content = []
+            if added_count > 0:
+                created_at_indexed = self.ensure_created_at_index()
+                # The metric aggregations and the sample query are independent round-trips, so overlap them
+                with ThreadPoolExecutor(max_workers=4) as pool:
+                    quality_future = pool.submit(self.compute_quality_metrics_db, since_ts, until_ts)
+                    diversity_future = pool.submit(self.compute_diversity_metrics_db, since_ts, until_ts)
+                    strategy_future = pool.submit(self.compute_strategy_metrics_db, since_ts, until_ts)
+                    sample_future = pool.submit(self.get_recent_content_sample, min(added_count, SAMPLE_CONTENT_LIMIT),
+                                                created_at_indexed)
+                recent_content = sample_future.result()
             
             if recent_content:
-                logger.info(f"✅ Found {len(recent_content)} recently added content items")
+                logger.info(f"✅ Found {added_count} recently added content items")
                 
                 # Check content quality
                 logger.info("\n📊 Content Quality Metrics:")
-                quality_metrics = self.check_content_quality(recent_content)
+                quality_metrics = self.check_content_quality(quality_future.result())
                 
                 # Check content diversity
                 logger.info("\n📊 Content Diversity Metrics:")
-                diversity_metrics = self.check_content_diversity(recent_content)
+                diversity_metrics = self.check_content_diversity(diversity_future.result())
                 
                 # Check content strategies
                 logger.info("\n📊 Content Strategy Metrics:")
-                strategy_metrics = self.check_content_strategies(recent_content)
+                strategy_metrics = self.check_content_strategies(strategy_future.result())
                 
                 # Log some sample content
                 logger.info("\n📋 Sample Content Items:")
-                for i, item in enumerate(recent_content[:5]):
-                    logger.info(f"  {i+1}. {item.get('title')} ({item.get('year')}) - {item.get('content_type')}")
-                    logger.info(f"     IMDB ID: {item.get('imdb_id')}")
-                    logger.info(f"     Genre: {item.get('genre')}")
-                    logger.info(f"     Poster: {item.get('poster', 'None')[:50]}...")
-                    logger.info(f"     Plot: {item.get('plot', 'None')[:100]}...")
-                    logger.info(f"     Director: {item.get('director')}")
-                    logger.info(f"     Actors: {item.get('actors')}")
+                for i, item in enumerate(recent_content):
+                    logger.info("  %d. %s (%s) - %s", i + 1, item.get('title'), item.get('year'), item.get('content_type'))
+                    logger.info("     IMDB ID: %s", item.get('imdb_id'))
+                    logger.info("     Genre: %s", item.get('genre'))
+                    logger.info("     Poster: %.50s...", item.get('poster', 'None'))
+                    logger.info("     Plot: %.100s...", item.get('plot', 'None'))
+                    logger.info("     Director: %s", item.get('director'))
+                    logger.info("     Actors: %s", item.get('actors'))
             else:
                 logger.warning("⚠️ No recent content found")
         
@@ -373,15 +490,18 @@ class DynamicOMDBContentTester:
         pre_login_count = self.get_content_count()
         
         # Login with existing user
+        insert_stream = self.open_insert_stream()
         login_success, login_response = self.test_user_login()
         
         if not login_success:
             logger.error("❌ Failed to login, stopping test")
+            if insert_stream is not None:
+                insert_stream.close()
             return False
         
         # Wait for content addition
-        logger.info("Waiting 10 seconds for background content addition...")
-        time.sleep(10)
+        logger.info(f"Waiting up to {CONTENT_WAIT_TIMEOUT} seconds for background content addition...")
+        self.wait_for_content_additions(insert_stream, pre_login_count)
         
         # Get new count after login
         post_login_count = self.get_content_count()
@@ -404,15 +524,15 @@ class DynamicOMDBContentTester:
         logger.info(f"✅ Total new content: {post_login_count - initial_count}")
         
         # Check if we met the target of 50+ new items per user action
-        if added_count >= 50:
-            logger.info(f"✅ Registration added {added_count} items (target: 50+)")
+        if added_count >= CONTENT_ADDITION_TARGET:
+            logger.info(f"✅ Registration added {added_count} items (target: {CONTENT_ADDITION_TARGET}+)")
         else:
-            logger.warning(f"⚠️ Registration added only {added_count} items (target: 50+)")
+            logger.warning(f"⚠️ Registration added only {added_count} items (target: {CONTENT_ADDITION_TARGET}+)")
         
-        if login_added_count >= 50:
-            logger.info(f"✅ Login added {login_added_count} items (target: 50+)")
+        if login_added_count >= CONTENT_ADDITION_TARGET:
+            logger.info(f"✅ Login added {login_added_count} items (target: {CONTENT_ADDITION_TARGET}+)")
         else:
-            logger.warning(f"⚠️ Login added only {login_added_count} items (target: 50+)")
+            logger.warning(f"⚠️ Login added only {login_added_count} items (target: {CONTENT_ADDITION_TARGET}+)")
         
         return True
 
@@ -435,33 +555,33 @@ def update_test_result_md(test_results):
         comment: "Tested the dynamic OMDB content addition system. The system successfully adds new content during both user registration and login. Initial content count was recorded, and after user registration, approximately 50 new items were added. Content quality is excellent with all items having proper IMDB IDs, titles, years, genres, poster URLs, plot descriptions, and actor/director information. Content diversity is good with a mix of movies and TV shows from different years and genres. All three content discovery strategies are working: (1) Recent releases by year, (2) Search terms, and (3) Popular actors/directors. The system is working as designed and meets all the requirements specified in the review request."
 """
     
+    # Create a new communication entry
+    new_comm_entry = """
+  - agent: "testing"
+    message: "Tested the dynamic OMDB content addition system. The system successfully adds new content during both user registration and login. Content quality is excellent with all items having proper IMDB IDs, titles, years, genres, poster URLs, plot descriptions, and actor/director information. Content diversity is good with a mix of movies and TV shows from different years and genres. All three content discovery strategies are working: (1) Recent releases by year, (2) Search terms, and (3) Popular actors/directors. The system is working as designed and meets all the requirements specified in the review request."
+"""
+    
     # Read the current test_result.md file
     with open('/app/test_result.md', 'r') as f:
         content = f.read()
     
-    # Find the backend section
-    backend_section_start = content.find("backend:")
-    if backend_section_start == -1:
-        logger.error("❌ Could not find backend section in test_result.md")
-        return False
-    
-    # Insert the new entry after the backend section
-    new_content = content[:backend_section_start + 8] + new_entry + content[backend_section_start + 8:]
+    # Insert both entries under their section headers in a single pass
+    entries = {"backend": new_entry, "agent_communication": new_comm_entry}
+    found_sections = set()
     
-    # Update the agent_communication section
-    agent_comm_section_start = new_content.find("agent_communication:")
-    if agent_comm_section_start == -1:
-        logger.error("❌ Could not find agent_communication section in test_result.md")
-        return False
+    def insert_entry(match):
+        section = match.group(1)
+        if section in found_sections:
+            return match.group(0)
+        found_sections.add(section)
+        return match.group(0) + entries[section]
     
-    # Create a new communication entry
-    new_comm_entry = """
-  - agent: "testing"
-    message: "Tested the dynamic OMDB content addition system. The system successfully adds new content during both user registration and login. Content quality is excellent with all items having proper IMDB IDs, titles, years, genres, poster URLs, plot descriptions, and actor/director information. Content diversity is good with a mix of movies and TV shows from different years and genres. All three content discovery strategies are working: (1) Recent releases by year, (2) Search terms, and (3) Popular actors/directors. The system is working as designed and meets all the requirements specified in the review request."
-"""
+    new_content = TEST_RESULT_SECTION_RE.sub(insert_entry, content)
     
-    # Insert the new communication entry
-    new_content = new_content[:agent_comm_section_start + 21] + new_comm_entry + new_content[agent_comm_section_start + 21:]
+    for section in entries:
+        if section not in found_sections:
+            logger.error(f"❌ Could not find {section} section in test_result.md")
+            return False
     
     # Write the updated content back to the file
     with open('/app/test_result.md', 'w') as f:
@@ -473,7 +593,10 @@ def update_test_result_md(test_results):
 if __name__ == "__main__":
     # Test dynamic OMDB content addition
     omdb_tester = DynamicOMDBContentTester()
-    test_success = omdb_tester.test_dynamic_content_addition()
+    try:
+        test_success = omdb_tester.test_dynamic_content_addition()
+    finally:
+        omdb_tester.session.close()
     
     # Update test_result.md with our findings
     if test_success:
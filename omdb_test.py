@@ -1,71 +1,102 @@
-def test_omdb_api_integration(self):
-    """Test direct OMDB API integration with our API key"""
-    print("\n🔍 Testing OMDB API Integration...")
-    
-    omdb_api_key = "33f2519b"  # Using the provided API key
-    test_movie = "The Shawshank Redemption"
-    
-    try:
-        # Test direct OMDB API access
-        url = f"http://www.omdbapi.com/?apikey={omdb_api_key}&t={test_movie}&type=movie"
-        response = requests.get(url)
+import requests
+
+class OMDBAPITester:
+    def __init__(self):
+        self.test_results = []
+        # Parsed OMDB responses keyed by title
+        self._omdb_cache = {}
+
+    def fetch_omdb_movie(self, title):
+        """Fetch and parse OMDB data for a movie title, cached on the tester by title"""
+        if title not in self._omdb_cache:
+            omdb_api_key = "33f2519b"  # Using the provided API key
+            response = requests.get(
+                "http://www.omdbapi.com/",
+                params={"apikey": omdb_api_key, "t": title, "type": "movie"},
+                timeout=10
+            )
+            # Raising keeps failed lookups out of the cache
+            response.raise_for_status()
+            self._omdb_cache[title] = response.json()
         
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("Response") == "True":
-                print(f"✅ OMDB API direct access successful")
-                print(f"  Title: {data.get('Title')}")
-                print(f"  Year: {data.get('Year')}")
-                print(f"  IMDB Rating: {data.get('imdbRating')}")
-                
-                # Check if poster URL is valid
-                if data.get("Poster") and data.get("Poster") != "N/A":
-                    poster_url = data.get("Poster")
-                    print(f"  Poster URL: {poster_url}")
+        return self._omdb_cache[title]
+
+    def test_omdb_api_integration(self):
+        """Test direct OMDB API integration with our API key"""
+        print("\n🔍 Testing OMDB API Integration...")
+        
+        test_movie = "The Shawshank Redemption"
+        
+        try:
+            # Test direct OMDB API access
+            try:
+                data = self.fetch_omdb_movie(test_movie)
+                status_code = 200
+            except requests.HTTPError as e:
+                data, status_code = {}, e.response.status_code
+            
+            if status_code == 200:
+                if data.get("Response") == "True":
+                    print(f"✅ OMDB API direct access successful")
+                    print(f"  Title: {data.get('Title')}")
+                    print(f"  Year: {data.get('Year')}")
+                    print(f"  IMDB Rating: {data.get('imdbRating')}")
                     
-                    # Try to access the poster image
-                    poster_response = requests.head(poster_url)
-                    if poster_response.status_code == 200:
-                        print(f"  ✅ Poster URL is accessible")
+                    # Check if poster URL is valid
+                    if data.get("Poster") and data.get("Poster") != "N/A":
+                        poster_url = data.get("Poster")
+                        print(f"  Poster URL: {poster_url}")
                         
-                        # Check content type
-                        content_type = poster_response.headers.get('Content-Type', '')
-                        if 'image' in content_type.lower():
-                            print(f"  ✅ Poster URL returns an image ({content_type})")
+                        # Try to access the poster image
+                        poster_response = requests.head(poster_url, timeout=10)
+                        if poster_response.status_code == 200:
+                            print(f"  ✅ Poster URL is accessible")
+                            
+                            # Check content type
+                            content_type = poster_response.headers.get('Content-Type', '')
+                            if 'image' in content_type.lower():
+                                print(f"  ✅ Poster URL returns an image ({content_type})")
+                            else:
+                                print(f"  ⚠️ Poster URL does not return an image content type: {content_type}")
                         else:
-                            print(f"  ⚠️ Poster URL does not return an image content type: {content_type}")
+                            print(f"  ❌ Poster URL is not accessible: {poster_response.status_code}")
                     else:
-                        print(f"  ❌ Poster URL is not accessible: {poster_response.status_code}")
+                        print(f"  ⚠️ No poster URL available for this movie")
+                    
+                    self.test_results.append({
+                        "name": "OMDB API Integration", 
+                        "status": "PASS", 
+                        "details": f"Successfully retrieved data for '{test_movie}'"
+                    })
+                    return True, data
                 else:
-                    print(f"  ⚠️ No poster URL available for this movie")
-                
-                self.test_results.append({
-                    "name": "OMDB API Integration", 
-                    "status": "PASS", 
-                    "details": f"Successfully retrieved data for '{test_movie}'"
-                })
-                return True, data
+                    print(f"❌ OMDB API returned an error: {data.get('Error')}")
+                    self.test_results.append({
+                        "name": "OMDB API Integration", 
+                        "status": "FAIL", 
+                        "details": f"API error: {data.get('Error')}"
+                    })
             else:
-                print(f"❌ OMDB API returned an error: {data.get('Error')}")
+                print(f"❌ OMDB API request failed with status code: {status_code}")
                 self.test_results.append({
                     "name": "OMDB API Integration", 
                     "status": "FAIL", 
-                    "details": f"API error: {data.get('Error')}"
+                    "details": f"Request failed with status code: {status_code}"
                 })
-        else:
-            print(f"❌ OMDB API request failed with status code: {response.status_code}")
+        
+        except Exception as e:
+            print(f"❌ OMDB API test failed with error: {str(e)}")
             self.test_results.append({
                 "name": "OMDB API Integration", 
-                "status": "FAIL", 
-                "details": f"Request failed with status code: {response.status_code}"
+                "status": "ERROR", 
+                "details": str(e)
             })
-    
-    except Exception as e:
-        print(f"❌ OMDB API test failed with error: {str(e)}")
-        self.test_results.append({
-            "name": "OMDB API Integration", 
-            "status": "ERROR", 
-            "details": str(e)
-        })
-    
-    return False, {}
+        
+        return False, {}
+
+def main():
+    tester = OMDBAPITester()
+    tester.test_omdb_api_integration()
+
+if __name__ == "__main__":
+    main()